@@ -6,14 +6,30 @@ Search YouTube (no API key) using yt-dlp,
 then build and save content_plan_new.json from the top results.
 
 Usage:
-  pip install yt-dlp
-  python content_new.py
+  pip install yt-dlp orjson
+  python content_new.py [--pretty] [--topic TOPIC [--topic TOPIC ...]]
 """
 
+import argparse
+import atexit
+import contextlib
+import functools
+import hashlib
+import itertools
 import json
+import math
+import os
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import List, Dict, Optional, Any
 
+import orjson
+
+from src.cache import atomic_write_bytes
+
 # --- require yt-dlp ---
 try:
     import yt_dlp
@@ -22,74 +38,256 @@ except ImportError as exc:
     raise SystemExit(1) from exc
 
 
+YDL_OPTS = {
+    'quiet': True,
+    'no_warnings': True,
+    'extract_flat': 'in_playlist',
+    'skip_download': True,
+    'force_generic_extractor': False,
+}
+
+
+def _new_ydl() -> "yt_dlp.YoutubeDL":
+    ydl = yt_dlp.YoutubeDL(YDL_OPTS)
+    atexit.register(ydl.close)
+    return ydl
+
+
+# Guards every use of the shared instance, not just its construction:
+# a YoutubeDL instance is not safe to share between threads.
+_ydl_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_ydl() -> "yt_dlp.YoutubeDL":
+    """
+    Return a long-lived YoutubeDL instance so consecutive searches reuse its
+    HTTPS connection pool instead of re-doing the TLS handshake every call.
+    Only call this (and use the instance) while holding _ydl_lock.
+    """
+    return _new_ydl()
+
+
+def _warm_up_connection(timeout: float = 5.0):
+    """
+    Fire-and-forget: build the shared YoutubeDL and send a HEAD to www.youtube.com
+    in a background thread, so the first real search lands on an already open connection.
+    The HEAD holds _ydl_lock, so a search started meanwhile waits for it (bounded by `timeout`).
+    """
+    def warm():
+        try:
+            from yt_dlp.networking import HEADRequest
+            with _ydl_lock:
+                _get_ydl().urlopen(HEADRequest("https://www.youtube.com/", extensions={"timeout": timeout})).close()
+        except Exception:
+            pass  # best effort; the real search will simply connect itself
+
+    threading.Thread(target=warm, daemon=True).start()
+
+
+_thread_local = threading.local()
+
+
+def _thread_ydl() -> "yt_dlp.YoutubeDL":
+    """
+    Per-thread long-lived YoutubeDL for worker threads; a YoutubeDL instance
+    is not safe to share between threads.
+    """
+    ydl = getattr(_thread_local, "ydl", None)
+    if ydl is None:
+        ydl = _thread_local.ydl = _new_ydl()
+    return ydl
+
+
+@contextlib.contextmanager
+def _borrow_ydl():
+    """
+    Yield the shared (pre-warmed) YoutubeDL if no other thread is using it,
+    otherwise this thread's own instance, so one worker reuses the warmed connection.
+    """
+    if _ydl_lock.acquire(blocking=False):
+        try:
+            yield _get_ydl()
+        finally:
+            _ydl_lock.release()
+    else:
+        yield _thread_ydl()
+
+
+class _RateLimiter:
+    """
+    Global limiter spacing requests at least `interval` seconds apart across
+    threads, to stay clear of YouTube's captcha/503 throttling.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+_search_rate_limiter = _RateLimiter(1.0)
+
+
+# --- on-disk search cache ---
+SEARCH_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "ytautomation" / "search"
+SEARCH_CACHE_TTL = 24 * 60 * 60  # seconds
+
+
+def _search_cache_path(topic: str, limit: int) -> Path:
+    key = hashlib.sha1(f"{topic}|{limit}".encode("utf-8")).hexdigest()
+    return SEARCH_CACHE_DIR / f"{key}.json"
+
+
+def _read_search_cache(path: Path, max_age: Optional[float]) -> Optional[List[Dict[str, Optional[str]]]]:
+    """
+    Return the cached results at `path`, or None if missing, unreadable or older than `max_age`.
+    Pass max_age=None to accept stale entries.
+    """
+    try:
+        if max_age is not None and time.time() - path.stat().st_mtime > max_age:
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_search_cache(path: Path, results: List[Dict[str, Optional[str]]]):
+    """
+    Atomically write search results to the cache (write temp file, then os.replace).
+    """
+    try:
+        atomic_write_bytes(path, json.dumps(results, ensure_ascii=False).encode("utf-8"))
+    except OSError as e:
+        print(f"Warning: could not write search cache: {e}")
+
+
 def search_youtube(topic: str, limit: int = 10) -> List[Dict[str, Optional[str]]]:
     """
-    Use yt-dlp to search YouTube and get video results.
+    Search YouTube, serving results from the on-disk cache when they are less than 24h old.
+    If yt-dlp fails (e.g. 503 or captcha), a stale cached result is returned when available.
+    """
+    def fetch():
+        with _ydl_lock:
+            return _search_youtube_uncached(topic, limit, _get_ydl())
+    return _search_with_cache(topic, limit, fetch)
+
+
+def search_youtube_many(topics: List[str], limit: int = 10, workers: int = 4) -> List[List[Dict[str, Optional[str]]]]:
+    """
+    Search several topics concurrently; returns one result list per topic, in order.
+    Requests are globally rate limited and retried with back-off on 429/503, falling
+    back to cached results. Chain the lists (itertools.chain) to build a single plan.
     """
+    def search_one(topic: str) -> List[Dict[str, Optional[str]]]:
+        def search():
+            with _borrow_ydl() as ydl:
+                return _search_youtube_uncached(topic, limit, ydl)
+
+        def fetch():
+            return _fetch_with_backoff(search)
+        return _search_with_cache(topic, limit, fetch)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(search_one, topics))
+
+
+def _fetch_with_backoff(fetch, retries: int = 3, base_delay: float = 2.0):
+    """
+    Rate-limit `fetch` and retry it with exponential back-off when YouTube throttles us.
+    """
+    for attempt in range(retries):
+        _search_rate_limiter.wait()
+        try:
+            return fetch()
+        except yt_dlp.utils.DownloadError as e:
+            throttled = "429" in str(e) or "503" in str(e)
+            if not throttled or attempt == retries - 1:
+                raise
+            time.sleep(base_delay * 2 ** attempt)
+
+
+def _search_with_cache(topic: str, limit: int, fetch) -> List[Dict[str, Optional[str]]]:
+    cache_path = _search_cache_path(topic, limit)
+    cached = _read_search_cache(cache_path, SEARCH_CACHE_TTL)
+    if cached is not None:
+        return cached
+
     try:
-        ydl_opts = {
-            'quiet': True,
-            'no_warnings': True,
-            'extract_flat': True,
-            'force_generic_extractor': False,
-        }
-        
-        search_query = f"ytsearch{limit}:{topic}"
-        
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            result = ydl.extract_info(search_query, download=False)
-            
-            if not result or 'entries' not in result:
-                return []
-            
-            normalized = []
-            for video in result['entries']:
-                if not video:
-                    continue
-                
-                # Extract video information
-                video_id = video.get('id')
-                title = video.get('title')
-                
-                # Build YouTube link
-                link = f"https://www.youtube.com/watch?v={video_id}" if video_id else None
-                
-                # Extract channel information
-                channel = video.get('channel') or video.get('uploader')
-                
-                # Extract view count
-                view_count = video.get('view_count')
-                if view_count is not None:
-                    view_count = f"{view_count:,} views"
-                
-                # Extract duration
-                duration = video.get('duration')
-                if duration:
-                    mins, secs = divmod(int(duration), 60)
-                    duration_str = f"{int(mins)}:{int(secs):02d}"
-                else:
-                    duration_str = None
-                
-                normalized.append({
-                    "id": video_id,
-                    "title": title,
-                    "link": link,
-                    "channel": channel,
-                    "viewCount": view_count,
-                    "duration": duration_str,
-                    "publishedTime": None  # yt-dlp doesn't always provide this in search
-                })
-            
-            # Keep only items with an id
-            normalized = [n for n in normalized if n.get("id")]
-            return normalized
-            
+        results = fetch()
     except Exception as e:
-        print(f"Error searching YouTube: {e}")
+        stale = _read_search_cache(cache_path, None)
+        if stale is not None:
+            print(f"Error searching YouTube for '{topic}': {e}. Using cached results.")
+            return stale
+        print(f"Error searching YouTube for '{topic}': {e}")
         import traceback
         traceback.print_exc()
         return []
 
+    if results:
+        _write_search_cache(cache_path, results)
+    return results
+
+
+def _search_youtube_uncached(topic: str, limit: int, ydl: "yt_dlp.YoutubeDL") -> List[Dict[str, Optional[str]]]:
+    """
+    Use yt-dlp to search YouTube and get video results.
+    Raises on network/extraction errors so the caller can fall back to the cache.
+    """
+    search_query = f"ytsearch{limit}:{topic}"
+    
+    result = ydl.extract_info(search_query, download=False)
+    
+    if not result or 'entries' not in result:
+        return []
+    
+    normalized = []
+    for video in result['entries']:
+        if not video:
+            continue
+        
+        # Extract video information; skip items without an id
+        video_id = video.get('id')
+        if not video_id:
+            continue
+        title = video.get('title')
+        
+        # Build YouTube link
+        link = f"https://www.youtube.com/watch?v={video_id}"
+        
+        # Extract channel information
+        channel = video.get('channel') or video.get('uploader')
+        
+        # Flat search entries still carry view count and duration from the results page
+        normalized.append({
+            "id": video_id,
+            "title": title,
+            "link": link,
+            "channel": channel,
+            "viewCount": video.get('view_count'),  # raw int; format only when displayed
+            "duration": _format_duration(video.get('duration')),
+            "publishedTime": None  # yt-dlp doesn't always provide this in search
+        })
+    
+    return normalized
+
+
+def _format_duration(duration: Optional[float]) -> Optional[str]:
+    if not duration:
+        return None
+    mins, secs = divmod(int(duration), 60)
+    return f"{mins}:{secs:02d}"
+
 
 def build_plan_from_videos(videos: List[Dict[str, Optional[str]]], target_count: int = None) -> Dict:
     """
@@ -99,37 +297,38 @@ def build_plan_from_videos(videos: List[Dict[str, Optional[str]]], target_count:
     and youtube_id as null by default, so you can update them later when you upload your videos.
     If target_count exceeds the number of videos found, creates generic pending lessons.
     """
-    lessons = []
     actual_count = target_count if target_count else len(videos)
+    n_have = min(actual_count, len(videos))
     
-    for idx in range(actual_count):
-        chapter = (idx // 2) + 1
-        part = (idx % 2) + 1
-        
-        # Use video title if available, otherwise create generic title
-        if idx < len(videos):
-            v = videos[idx]
-            title = v.get("title") or f"Lesson {idx+1}"
-        else:
-            title = f"Lesson {idx+1}"
-        
-        lesson = {
-            "chapter": chapter,
-            "part": part,
-            "title": title,
+    # Use video titles where available, then pad with generic titles
+    lessons = [
+        {
+            "chapter": idx // 2 + 1,
+            "part": idx % 2 + 1,
+            "title": videos[idx].get("title") or f"Lesson {idx+1}",
             "status": "pending",
             "youtube_id": None
         }
-        lessons.append(lesson)
+        for idx in range(n_have)
+    ] + [
+        {
+            "chapter": idx // 2 + 1,
+            "part": idx % 2 + 1,
+            "title": f"Lesson {idx+1}",
+            "status": "pending",
+            "youtube_id": None
+        }
+        for idx in range(n_have, actual_count)
+    ]
     return {"lessons": lessons}
 
 
-def save_plan(plan: Dict, filename: str = "content_plan_new.json"):
+def save_plan(plan: Dict, filename: str = "content_plan_new.json", pretty: bool = False):
     """
-    Save the content plan to a JSON file.
+    Save the content plan to a JSON file (compact unless pretty=True).
     """
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(plan, f, ensure_ascii=False, indent=2)
+    with open(filename, "wb") as f:
+        f.write(orjson.dumps(plan, option=orjson.OPT_INDENT_2 if pretty else 0))
     print(f"\nSaved new content plan to '{filename}' ({len(plan.get('lessons', []))} lessons).")
 
 
@@ -147,35 +346,53 @@ def prompt_int(prompt_msg: str, default: int) -> int:
         return default
 
 
-def main():
+def main(pretty: bool = False, topics: Optional[List[str]] = None):
     """
     Main function to create a new content plan from YouTube search.
+    Pass several topics (--topic, repeatable) to search them concurrently; otherwise one topic is prompted for.
     """
     print("Create a new content_plan_new.json from a YouTube search (no API key).")
-    topic = input("Enter topic to search for: ").strip()
-    if not topic:
-        print("No topic provided — exiting.")
-        return
+    _warm_up_connection()
+    topics = [t.strip() for t in topics or [] if t.strip()]
+    if not topics:
+        topic = input("Enter topic to search for: ").strip()
+        if not topic:
+            print("No topic provided — exiting.")
+            return
+        topics = [topic]
     
     default_n = 10
     n = prompt_int(f"How many lessons to create? (default {default_n}): ", default_n)
 
-    print(f"\nSearching YouTube for '{topic}' (attempting top {n} results)...")
-    videos = search_youtube(topic, limit=n)
+    if len(topics) == 1:
+        print(f"\nSearching YouTube for '{topics[0]}' (attempting top {n} results)...")
+        videos = search_youtube(topics[0], limit=n)
+    else:
+        per_topic = math.ceil(n / len(topics))
+        print(f"\nSearching YouTube for {len(topics)} topics (attempting top {per_topic} results each)...")
+        videos = list(itertools.chain.from_iterable(search_youtube_many(topics, limit=per_topic)))
     
     if not videos:
         print("No videos found or unable to parse search results.")
         return
 
     plan = build_plan_from_videos(videos, target_count=n)
-    save_plan(plan, "content_plan_new.json")
+    save_plan(plan, "content_plan_new.json", pretty=pretty)
 
-    print("\nSummary:")
-    for i, lesson in enumerate(plan["lessons"], start=1):
-        print(f" {i:2d}. Chapter {lesson['chapter']} Part {lesson['part']} | {lesson['title'][:80]}")
-        print(f"     id: {lesson['youtube_id']}  | channel: {lesson.get('channel')}  | duration: {lesson.get('duration')}")
-        print(f"     views: {lesson.get('viewCount')}  | link: {lesson.get('link')}\n")
+    # Lessons only carry chapter/part/title/status/youtube_id, so that is all we print.
+    # Build the summary once and write it in a single call.
+    lines = ["\nSummary:"]
+    lines.extend(
+        f" {i:2d}. Chapter {lesson['chapter']} Part {lesson['part']} | {lesson['title'][:80]}"
+        for i, lesson in enumerate(plan["lessons"], start=1)
+    )
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Create content_plan_new.json from a YouTube search.")
+    parser.add_argument("--pretty", action="store_true", help="write the plan indented for manual editing")
+    parser.add_argument("--topic", action="append", dest="topics", metavar="TOPIC",
+                        help="topic to search for; repeat to search several topics concurrently")
+    args = parser.parse_args()
+    main(pretty=args.pretty, topics=args.topics)
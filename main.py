@@ -1,94 +1,197 @@
 import os
-import json
+import argparse
 import datetime
-import time
+import itertools
+import shutil
 import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import orjson
 from dotenv import load_dotenv
 
+try:
+    import msgpack
+except ImportError:  # optional: only used for the binary plan mirror
+    msgpack = None
+
 # Load environment variables from .env file
 load_dotenv()
 
 from src.generator import (
     generate_curriculum,
     generate_lesson_content,
+    generate_all_lesson_content,
     text_to_speech,
+    tts_batch,
     generate_visuals,
+    prefetch_backgrounds,
     create_video,
     YOUR_NAME
 )
 from src.uploader import upload_to_youtube
 
 CONTENT_PLAN_FILE = Path("content_plan.json")
+# Binary copy of the plan for faster reloads; content_plan.json stays the editable source of truth
+CONTENT_PLAN_MIRROR = Path("content_plan.msgpack")
 OUTPUT_DIR = Path("output")
+# Scratch space for intermediate slides/WAVs: RAM-backed /dev/shm on Linux runners, else the output folder
+SHM_DIR = Path("/dev/shm")
+WORK_ROOT = SHM_DIR if os.name == 'posix' and SHM_DIR.is_dir() else OUTPUT_DIR
 LESSONS_PER_RUN = 1
+MAX_WORKERS = 8
+# Serialized plan as last read from / written to disk, used to skip no-op rewrites
+_saved_plan_text = None
+# orjson options for content_plan.json: indented by default (it is hand-edited and committed by CI), compact with --compact
+_plan_json_option = orjson.OPT_INDENT_2
 
 def get_content_plan():
+    global _saved_plan_text
     if not CONTENT_PLAN_FILE.exists():
         print("📄 content_plan.json not found. Generating new plan...")
         new_plan = generate_curriculum()
-        with open(CONTENT_PLAN_FILE, 'w') as f:
-            json.dump(new_plan, f, indent=2)
+        update_content_plan(new_plan)
         print(f"✅ New curriculum saved to {CONTENT_PLAN_FILE}")
         return new_plan
     else:
         try:
-            with open(CONTENT_PLAN_FILE, 'r') as f:
-                plan = json.load(f)
+            plan = load_plan_mirror()
+            if plan is None:
+                with open(CONTENT_PLAN_FILE, 'rb') as f:
+                    plan = orjson.loads(f.read())
+                write_plan_mirror(plan)
             if not plan.get("lessons") or not isinstance(plan["lessons"], list):
                 raise ValueError("⚠️ Invalid or empty lesson plan detected.")
+            _saved_plan_text = orjson.dumps(plan, option=_plan_json_option)
             return plan
         except Exception as e:
             print(f"❌ ERROR loading existing plan: {e}. Regenerating...")
             new_plan = generate_curriculum()
-            with open(CONTENT_PLAN_FILE, 'w') as f:
-                json.dump(new_plan, f, indent=2)
+            update_content_plan(new_plan)
             return new_plan
 
 
 def update_content_plan(plan):
-    with open(CONTENT_PLAN_FILE, 'w') as f:
-        json.dump(plan, f, indent=2)
+    global _saved_plan_text
+    plan_text = orjson.dumps(plan, option=_plan_json_option)
+    if plan_text == _saved_plan_text:
+        return
+    # Write to a temp file and rename so a crash mid-write never truncates the plan
+    temp_file = CONTENT_PLAN_FILE.with_suffix('.json.tmp')
+    with open(temp_file, 'wb') as f:
+        f.write(plan_text)
+    os.replace(temp_file, CONTENT_PLAN_FILE)
+    _saved_plan_text = plan_text
+    write_plan_mirror(plan)
+
+
+def load_plan_mirror():
+    """Loads the msgpack mirror if it is at least as new as content_plan.json and holds a valid plan, else returns None."""
+    if msgpack is None or not CONTENT_PLAN_MIRROR.exists():
+        return None
+    try:
+        if CONTENT_PLAN_MIRROR.stat().st_mtime_ns < CONTENT_PLAN_FILE.stat().st_mtime_ns:
+            return None  # content_plan.json was edited after the mirror was written
+        with open(CONTENT_PLAN_MIRROR, 'rb') as f:
+            plan = msgpack.unpack(f, raw=False)
+        # A bad mirror must fall back to the JSON file, never trigger a curriculum regeneration
+        if not isinstance(plan, dict) or not plan.get("lessons") or not isinstance(plan["lessons"], list):
+            raise ValueError("mirror does not contain a valid lesson plan")
+        return plan
+    except Exception as e:
+        print(f"⚠️ Could not read {CONTENT_PLAN_MIRROR}: {e}. Falling back to JSON.")
+        return None
+
+
+def write_plan_mirror(plan):
+    if msgpack is None:
+        return
+    try:
+        temp_file = CONTENT_PLAN_MIRROR.with_suffix('.msgpack.tmp')
+        with open(temp_file, 'wb') as f:
+            msgpack.pack(plan, f)
+        os.replace(temp_file, CONTENT_PLAN_MIRROR)
+    except Exception as e:
+        print(f"⚠️ Could not write {CONTENT_PLAN_MIRROR}: {e}")
+
+
+def find_pending_lessons(plan, limit):
+    """
+    Returns up to `limit` (index, lesson) pairs whose status is 'pending'.
+    The scan starts at the plan's 'next_pending_index' hint and wraps around,
+    so lessons reset to pending by hand are still picked up.
+    """
+    lessons = plan['lessons']
+    start = plan.get('next_pending_index', 0)
+    if not isinstance(start, int) or not 0 <= start < len(lessons):
+        start = 0
+    order = itertools.chain(range(start, len(lessons)), range(start))
+    pending = ((i, lessons[i]) for i in order if lessons[i]['status'] == 'pending')
+    return list(itertools.islice(pending, limit))
+
 
+def index_lessons_by_title(lessons):
+    """Maps normalized title -> lesson, keeping the first lesson when titles repeat."""
+    by_title = {}
+    for lesson in lessons:
+        by_title.setdefault(lesson['title'].strip().lower(), lesson)
+    return by_title
 
 
-def produce_lesson_videos(lesson):
+def produce_lesson_videos(lesson, lesson_content=None):
     print(f"\n▶️ Starting production for Lesson: '{lesson['title']}'")
     unique_id = f"{datetime.datetime.now().strftime('%Y%m%d')}_{lesson['chapter']}_{lesson['part']}"
 
-    lesson_content = generate_lesson_content(lesson['title'])
+    # Intermediate WAVs and slides go in a per-run folder (in RAM when possible) that is removed in one go afterwards
+    work_dir = WORK_ROOT / f"ytauto-{unique_id}-{uuid.uuid4().hex[:8]}"
+    work_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        return _produce_lesson_videos(lesson, unique_id, work_dir, lesson_content)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        print(f"🧹 Deleted temporary work folder: {work_dir}")
+
+
+def _produce_lesson_videos(lesson, unique_id, work_dir, lesson_content=None):
+    title = lesson['title']
+    if lesson_content is None:
+        lesson_content = generate_lesson_content(title)
 
     print("\n--- Producing Long-Form Video ---")
 
-    intro_slide = {"title": lesson['title'], "content": f"Chapter {lesson['chapter']} | Part {lesson['part']}"}
+    intro_slide = {"title": title, "content": f"Chapter {lesson['chapter']} | Part {lesson['part']}"}
     outro_slide = {"title": "Thanks for Watching!", "content": "Like, Share & Subscribe for more daily AI content!\n#AIforDevelopers"}
     all_slides = [intro_slide] + lesson_content['long_form_slides'] + [outro_slide]
 
     slide_scripts = [
-        f"Hello and welcome to AI for Developers. I'm {YOUR_NAME} talking bot. Today’s lesson is titled {lesson['title']}.",
+        f"Hello and welcome to AI for Developers. I'm {YOUR_NAME} talking bot. Today’s lesson is titled {title}.",
         *[s['content'] for s in lesson_content['long_form_slides']],
         "Thanks for watching! If you found this helpful, make sure to subscribe to our channel and hit the like button."
     ]
 
-    slide_audio_paths = []
-    for i, script in enumerate(slide_scripts):
-        audio_path = OUTPUT_DIR / f"audio_slide_{i+1}_{unique_id}.mp3"
-        wav_path = text_to_speech(script, audio_path)
-        slide_audio_paths.append(wav_path)
+    audio_paths = [work_dir / f"audio_slide_{i+1}.mp3" for i in range(len(slide_scripts))]
+    slide_dir = work_dir / "slides_long"
+    slide_titles = [slide.get("title", "") for slide in all_slides]
+
+    # Network-bound stages (TTS and Pexels downloads) run in the background while this
+    # thread renders each slide as soon as its background image has arrived.
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as io_pool:
+        audio_future = io_pool.submit(tts_batch, slide_scripts, audio_paths, MAX_WORKERS)
+        backgrounds = prefetch_backgrounds(slide_titles, 'long', io_pool)
+        slide_paths = [
+            generate_visuals(
+                output_dir=slide_dir,
+                video_type='long',
+                slide_content=slide,
+                slide_number=i + 1,
+                total_slides=len(all_slides),
+                bg_image=backgrounds[slide_title].result()
+            )
+            for i, (slide, slide_title) in enumerate(zip(all_slides, slide_titles))
+        ]
+        slide_audio_paths = audio_future.result()
     print(f"🎧 Total slide audios: {len(slide_audio_paths)}")
 
-    slide_dir = OUTPUT_DIR / f"slides_long_{unique_id}"
-    slide_paths = []
-    for i, slide in enumerate(all_slides):
-        path = generate_visuals(
-            output_dir=slide_dir,
-            video_type='long',
-            slide_content=slide,
-            slide_number=i + 1,
-            total_slides=len(all_slides)
-        )
-        slide_paths.append(path)
-
     long_video_path = OUTPUT_DIR / f"long_video_{unique_id}.mp4"
     print(f"🎥 Creating long-form video at: {long_video_path}")
     create_video(slide_paths, slide_audio_paths, long_video_path, 'long')
@@ -96,20 +199,20 @@ def produce_lesson_videos(lesson):
     long_thumb_path = generate_visuals(
         output_dir=OUTPUT_DIR,
         video_type='long',
-        thumbnail_title=lesson['title']
+        thumbnail_title=title
     )
 
     print("\n--- Producing Short Video ---")
+    highlight = (lesson_content.get('short_form_highlight') or '').strip()
     # short_script = f"{lesson_content['short_form_highlight']}"
-    short_script = (f"{lesson_content['short_form_highlight']}\n\n"
-    f"Link to the full lesson is in the description below.")
-    short_audio_mp3_path = OUTPUT_DIR / f"short_audio_{unique_id}.mp3"
+    short_script = "\n\n".join([highlight, "Link to the full lesson is in the description below."])
+    short_audio_mp3_path = work_dir / "short_audio.mp3"
     short_audio_path = text_to_speech(short_script, short_audio_mp3_path)
 
-    short_slide_dir = OUTPUT_DIR / f"slides_short_{unique_id}"
+    short_slide_dir = work_dir / "slides_short"
     short_slide_content = {
         "title": "Quick Tip!",
-        "content": f"{lesson_content['short_form_highlight']}\n\n#AI for developers by chaitanya"
+        "content": "\n\n".join([highlight, "#AI for developers by chaitanya"])
     }
     short_slide_path = generate_visuals(
         output_dir=short_slide_dir,
@@ -126,33 +229,31 @@ def produce_lesson_videos(lesson):
     short_thumb_path = generate_visuals(
         output_dir=OUTPUT_DIR,
         video_type='short',
-        thumbnail_title=f"Quick Tip: {lesson['title']}"
+        thumbnail_title=f"Quick Tip: {title}"
     )
 
     print("\n📤 Uploading to YouTube...")
     hashtags = lesson_content.get("hashtags", "#AI #Developer #LearnAI")
-    long_desc = f"Part of the 'AI for Developers' series by {YOUR_NAME}.\n\nToday's Lesson: {lesson['title']}\n\n{hashtags}"
-    long_tags = "AI, Artificial Intelligence, Developer, Programming, Tutorial, " + lesson['title'].replace(" ", ", ")
+    long_desc = f"Part of the 'AI for Developers' series by {YOUR_NAME}.\n\nToday's Lesson: {title}\n\n{hashtags}"
+    long_tags = f"AI,Artificial Intelligence,Developer,Programming,Tutorial,{title.replace(' ', ',')}"
 
     long_video_id = upload_to_youtube(
         long_video_path,
-        lesson['title'],
+        title,
         long_desc,
         long_tags,
         long_thumb_path
     )
 
     if long_video_id:
-        print("⏳ Waiting 30 seconds before uploading the short...")
-        time.sleep(30)
-        highlight = (lesson_content.get('short_form_highlight') or '').strip()
-        if not highlight:
-            highlight = f"AI Quick Tip: {lesson['title']}"
-        short_title = f"{highlight[:90].rstrip()} #Shorts"
+        title_text = highlight or f"AI Quick Tip: {title}"
+        short_title = f"{title_text[:90].rstrip()} #Shorts"
         # short_desc = f"Watch the full lesson with {YOUR_NAME} here: https://www.youtube.com/watch?v={long_video_id}\n\n#AI #Programming #Tech #Developer"
-        short_desc = (f"{lesson_content['short_form_highlight']}\n\n"
-                      f"Watch the full lesson with {YOUR_NAME} here: https://www.youtube.com/watch?v={long_video_id}\n\n"
-                      f"{hashtags}")
+        short_desc = "\n\n".join([
+            highlight,
+            f"Watch the full lesson with {YOUR_NAME} here: https://www.youtube.com/watch?v={long_video_id}",
+            hashtags
+        ])
         upload_to_youtube(
             short_video_path,
             short_title.strip(),
@@ -164,7 +265,10 @@ def produce_lesson_videos(lesson):
     return None
 
 
-def main():
+def main(compact=False):
+    global _plan_json_option
+    _plan_json_option = 0 if compact else orjson.OPT_INDENT_2
+
     print("🚀 Starting Autonomous AI Course Generator")
     print(f"📁 Current working dir: {os.getcwd()}")
     print(f"📁 OUTPUT_DIR: {OUTPUT_DIR.resolve()}")
@@ -173,7 +277,7 @@ def main():
         OUTPUT_DIR.mkdir(exist_ok=True)
         print(f"📁 Created output folder: {OUTPUT_DIR.exists()}")
         plan = get_content_plan()
-        pending = [(i, lesson) for i, lesson in enumerate(plan['lessons']) if lesson['status'] == 'pending']
+        pending = find_pending_lessons(plan, LESSONS_PER_RUN)
 
         if not pending:
             print("🎉 All lessons produced! Generating new content plan to restart from scratch...")
@@ -182,21 +286,28 @@ def main():
             new_plan = generate_curriculum(previous_titles=previous_titles)  # 🔁 Pass prior titles
             update_content_plan(new_plan)
             plan = new_plan
-            pending = [(i, lesson) for i, lesson in enumerate(new_plan['lessons']) if lesson['status'] == 'pending']
+            pending = find_pending_lessons(new_plan, LESSONS_PER_RUN)
             if not pending:
                 print("⚠️ Curriculum generated but no valid lessons found.")
                 return
 
-        for lesson_index, lesson in pending[:LESSONS_PER_RUN]:
+        lessons_by_title = index_lessons_by_title(plan['lessons'])
+
+        lesson_contents = generate_all_lesson_content([lesson['title'] for _, lesson in pending])
+
+        for lesson_index, lesson in pending:
+            if lesson['title'] not in lesson_contents:
+                print(f"⚠️ Skipping lesson without content (it stays pending): {lesson['title']}")
+                continue
             try:
-                video_id = produce_lesson_videos(lesson)
+                video_id = produce_lesson_videos(lesson, lesson_contents[lesson['title']])
                 if video_id:
-                    for original_lesson in plan['lessons']:
-                        if original_lesson['title'].strip().lower() == lesson['title'].strip().lower():
-                            original_lesson['status'] = 'complete'
-                            original_lesson['youtube_id'] = video_id
-                            print(f"✅ Completed lesson: {lesson['title']}")
-                            break
+                    original_lesson = lessons_by_title.get(lesson['title'].strip().lower())
+                    if original_lesson is not None:
+                        original_lesson['status'] = 'complete'
+                        original_lesson['youtube_id'] = video_id
+                        plan['next_pending_index'] = lesson_index + 1
+                        print(f"✅ Completed lesson: {lesson['title']}")
                     else:
                         print(f"⚠️ Could not find lesson in plan to mark as complete: {lesson['title']}")
                 else:
@@ -212,12 +323,8 @@ def main():
         print("❌ Critical error in main()")
         traceback.print_exc()
 
-    try:
-        for file in OUTPUT_DIR.glob("*.wav"):
-            file.unlink()
-            print(f"🧹 Deleted: {file}")
-    except Exception as e:
-        print(f"⚠️ Could not clean up .wav files: {e}")
-
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Produce and upload the next pending lesson(s).")
+    parser.add_argument("--compact", action="store_true", help="write content_plan.json without indentation")
+    args = parser.parse_args()
+    main(compact=args.compact)
@@ -0,0 +1,42 @@
+# FILE: src/cache.py
+# Helpers shared by the on-disk caches (YouTube search results, Pexels images, Gemini responses).
+
+import os
+import threading
+import time
+
+
+def atomic_write_bytes(path, data):
+    """
+    Atomically writes bytes to path (temp file + os.replace). The temp name is unique per
+    process and thread, so concurrent writers of the same path never clobber each other. Raises OSError.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
+    except OSError:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+def prune_expired(directory, max_age):
+    """
+    Deletes files in directory last written more than max_age seconds ago (including temp files
+    left behind by interrupted writes). Returns the number of files removed; errors are ignored.
+    """
+    cutoff = time.time() - max_age
+    removed = 0
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except OSError:
+            continue  # removed concurrently or not ours to delete
+    return removed
@@ -3,14 +3,25 @@
 
 import os
 import json
+import time
+import hashlib
+import subprocess
+import textwrap
+import threading
+import wave
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
 from io import BytesIO
 import google.generativeai as genai
 from gtts import gTTS
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from moviepy.editor import AudioFileClip, ImageClip, CompositeAudioClip, concatenate_videoclips, vfx
-from moviepy.config import change_settings
+from moviepy.config import change_settings, get_setting
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
 from pathlib import Path
+from src.cache import atomic_write_bytes, prune_expired
 
 # --- Configuration ---
 ASSETS_PATH = Path("assets")
@@ -18,31 +29,142 @@ FONT_FILE = ASSETS_PATH / "fonts/arial.ttf"
 BACKGROUND_MUSIC_PATH = ASSETS_PATH / "music/bg_music.mp3"
 FALLBACK_THUMBNAIL_FONT = ImageFont.load_default()
 YOUR_NAME = "Chaitanya"
+GEMINI_MODEL_NAME = 'models/gemini-2.5-flash'
+# The three keys every lesson object needs; shared by the single-lesson and batched prompts
+LESSON_CONTENT_FORMAT = """
+1. "long_form_slides": A list of 7 to 8 slide objects for a longer, more detailed main video. Each object needs a "title" and "content" key.
+2. "short_form_highlight": A single, punchy, 1-2 sentence summary for a YouTube Short.
+3. "hashtags": A string of 5-7 relevant, space-separated hashtags for this lesson (e.g., "#GenerativeAI #LLM #Developer","#NeuralNetworks #BeginnerAI #AIforDevelopers").
+"""
+FFMPEG_BINARY = get_setting("FFMPEG_BINARY")
+PEXELS_CACHE_DIR = ASSETS_PATH / ".pexels_cache"
+# Slide titles are unique per lesson, so the cache mostly serves re-runs of a failed lesson: keep it short
+PEXELS_CACHE_TTL = float(os.getenv("PEXELS_CACHE_TTL_DAYS", "3")) * 24 * 60 * 60  # seconds
+GEMINI_CACHE_DIR = ASSETS_PATH / ".gemini_cache"
+GEMINI_CACHE_TTL = float(os.getenv("GEMINI_CACHE_TTL_DAYS", "7")) * 24 * 60 * 60  # seconds
+
+# Cache directories already pruned of expired entries by this process
+_PRUNED_CACHE_DIRS = set()
+_PRUNE_LOCK = threading.Lock()
+
+# gTTS is a remote API; cap concurrent requests to avoid rate limits
+_TTS_SEMAPHORE = threading.Semaphore(4)
+
+# Shared keep-alive session so parallel Pexels requests reuse TCP/TLS connections
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+))
 
 # GitHub Actions compatibility for ImageMagick
 if os.name == 'posix':
     change_settings({"IMAGEMAGICK_BINARY": "/usr/bin/convert"})
 
 
+def _read_cache(path, max_age):
+    """Returns the cached bytes at path, or None if missing or older than max_age seconds."""
+    try:
+        if time.time() - path.stat().st_mtime > max_age:
+            return None
+        return path.read_bytes()
+    except OSError:
+        return None
+
+
+def _write_cache(path, data, max_age=None):
+    """
+    Atomically writes bytes to a cache file (temp file + os.replace).
+    With max_age, the first write to a cache directory in this process also deletes its expired
+    entries, so caches persisted between CI runs don't grow forever.
+    """
+    if max_age is not None:
+        with _PRUNE_LOCK:
+            prune = path.parent not in _PRUNED_CACHE_DIRS
+            _PRUNED_CACHE_DIRS.add(path.parent)
+        if prune:
+            removed = prune_expired(path.parent, max_age)
+            if removed:
+                print(f"🧹 Removed {removed} expired cache file(s) from {path.parent}")
+    try:
+        atomic_write_bytes(path, data)
+    except OSError as e:
+        print(f"⚠️ Could not write cache file {path}: {e}")
+
+
+def disk_memoize(cache_dir, max_age, namespace="", validate=None):
+    """
+    Decorator that caches a function's JSON-serializable result on disk.
+    The key is a sha256 of the namespace and the call arguments, so changing the namespace
+    (e.g. the model name) invalidates earlier entries.
+    Results rejected by `validate` are returned but never stored, and stored entries it rejects
+    are ignored, so one malformed result can't be replayed on every run until it expires.
+    """
+    cache_dir = Path(cache_dir)
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args):
+            key = hashlib.sha256(json.dumps([namespace, args]).encode("utf-8")).hexdigest()
+            path = cache_dir / f"{key}.json"
+            cached = _read_cache(path, max_age)
+            if cached is not None:
+                try:
+                    value = json.loads(cached)
+                    if validate is None or validate(value):
+                        return value
+                except ValueError:
+                    pass  # corrupt entry; regenerate and overwrite it
+            result = func(*args)
+            if validate is None or validate(result):
+                _write_cache(path, json.dumps(result).encode("utf-8"), max_age)
+            return result
+        return wrapper
+    return decorator
+
+
 def get_pexels_image(query, video_type):
     """Searches for a relevant image on Pexels and returns the image object."""
+    orientation = 'landscape' if video_type == 'long' else 'portrait'
+    image_bytes = _get_pexels_image_bytes(query, orientation)
+    if image_bytes is None:
+        return None
+    try:
+        return Image.open(BytesIO(image_bytes)).convert("RGBA")
+    except Exception as e:
+        print(f"❌ Could not decode Pexels image for query '{query}': {e}")
+        return None
+
+
+@lru_cache(maxsize=128)
+def _get_pexels_image_bytes(query, orientation):
+    """Returns the raw image bytes for a query, served from the on-disk cache when possible."""
+    key = hashlib.sha1(f"{query}|{orientation}".encode("utf-8")).hexdigest()
+    cache_path = PEXELS_CACHE_DIR / key
+    cached = _read_cache(cache_path, PEXELS_CACHE_TTL)
+    if cached is not None:
+        return cached
+
     pexels_api_key = os.getenv("PEXELS_API_KEY")
     if not pexels_api_key:
         print("⚠️ PEXELS_API_KEY not found. Using solid color background.")
         return None
 
-    orientation = 'landscape' if video_type == 'long' else 'portrait'
     try:
         headers = {"Authorization": pexels_api_key}
         params = {"query": f"abstract {query}", "per_page": 1, "orientation": orientation}
-        response = requests.get("https://api.pexels.com/v1/search", headers=headers, params=params, timeout=15)
+        response = _SESSION.get("https://api.pexels.com/v1/search", headers=headers, params=params, timeout=15)
         response.raise_for_status()
         data = response.json()
         if data.get('photos'):
-            image_url = data['photos'][0]['src']['large2x']
-            image_response = requests.get(image_url, timeout=15)
+            # 'landscape' (1200x627) / 'portrait' (800x1200) crops already exceed the half-resolution
+            # size generate_visuals blurs at, and are a fraction of a 'large2x' download
+            image_url = data['photos'][0]['src'][orientation]
+            image_response = _SESSION.get(image_url, timeout=15)
             image_response.raise_for_status()
-            return Image.open(BytesIO(image_response.content)).convert("RGBA")
+            _write_cache(cache_path, image_response.content, PEXELS_CACHE_TTL)
+            return image_response.content
     except requests.exceptions.RequestException as e:
         print(f"❌ Network error fetching Pexels image for query '{query}': {e}")
     except Exception as e:
@@ -50,21 +172,33 @@ def get_pexels_image(query, video_type):
     return None
 
 
+def prefetch_backgrounds(titles, video_type, executor):
+    """
+    Starts fetching the Pexels backgrounds for several slide titles on `executor`.
+    Returns {title: Future}; each future resolves to the image or None.
+    """
+    return {title: executor.submit(get_pexels_image, title, video_type) for title in dict.fromkeys(titles)}
+
+
 def text_to_speech(text, output_path):
     """Converts text to speech using gTTS and ensures clean audio using WAV format."""
     print(f"🎤 Converting script to speech...")
     try:
-        temp_mp3_path = str(output_path).replace('.mp3', '_temp.mp3')
         wav_path = str(output_path.with_suffix('.wav'))
 
-        tts = gTTS(text=text, lang='en', slow=False)
-        tts.save(temp_mp3_path)
-
-        # Use moviepy instead of pydub for Python 3.13+ compatibility
-        audio_clip = AudioFileClip(temp_mp3_path)
-        audio_clip.write_audiofile(wav_path, codec='pcm_s16le', fps=44100, nbytes=2, buffersize=2000, logger=None)
-        audio_clip.close()
-        os.remove(temp_mp3_path)
+        mp3_buffer = BytesIO()
+        gTTS(text=text, lang='en', slow=False).write_to_fp(mp3_buffer)
+
+        # Decode the MP3 bytes straight to WAV with a single ffmpeg call (no temp MP3, no moviepy re-encode).
+        # Write to a temp file and rename so a concurrent reader never sees a partial WAV
+        temp_wav_path = str(output_path.with_suffix('.tmp.wav'))
+        subprocess.run(
+            [FFMPEG_BINARY, "-y", "-loglevel", "error", "-i", "pipe:0",
+             "-ac", "1", "-ar", "44100", "-acodec", "pcm_s16le", temp_wav_path],
+            input=mp3_buffer.getvalue(),
+            check=True
+        )
+        os.replace(temp_wav_path, wav_path)
 
         print(f"✅ Speech generated and converted to WAV successfully!")
         return Path(wav_path)
@@ -74,13 +208,79 @@ def text_to_speech(text, output_path):
         raise
 
 
+def tts_batch(texts, output_paths, max_workers=8):
+    """Runs text_to_speech for several scripts concurrently. Returns the WAV paths in input order."""
+    def synthesize(text, output_path):
+        with _TTS_SEMAPHORE:
+            return text_to_speech(text, output_path)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(synthesize, texts, output_paths))
+
+
+_MODEL = None
+
+
+def _gemini_model():
+    """Configures the Gemini SDK and builds the model once per process."""
+    global _MODEL
+    if _MODEL is None:
+        genai.configure(api_key=os.environ["GOOGLE_API_KEY"])
+        _MODEL = genai.GenerativeModel(GEMINI_MODEL_NAME)
+    return _MODEL
+
+
+def _generate_json(prompt):
+    """
+    Streams a Gemini response and returns the first complete JSON value in it.
+    Decoding starts at the first '{' or '[', so markdown fences and surrounding chatter are ignored,
+    and the stream is abandoned as soon as a complete value has arrived.
+    """
+    model = _gemini_model()
+    decoder = json.JSONDecoder()
+    text = ""
+    for chunk in model.generate_content(prompt, stream=True):
+        try:
+            text += chunk.text
+        except ValueError:
+            continue  # chunk without text parts (e.g. the final finish-reason chunk)
+        starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+        if not starts:
+            continue
+        try:
+            value, _ = decoder.raw_decode(text, min(starts))
+            return value
+        except json.JSONDecodeError:
+            continue  # incomplete so far; wait for more chunks
+    raise ValueError(f"No complete JSON value in model response: {text[:200]!r}")
+
+
+def _is_lesson_content(content):
+    """True if content looks like one lesson object: a dict with a non-empty 'long_form_slides' list."""
+    return isinstance(content, dict) and isinstance(content.get("long_form_slides"), list) and bool(content["long_form_slides"])
+
+
+def _is_lesson_batch(contents):
+    """True if a batched response is a dict holding at least one usable lesson object."""
+    return isinstance(contents, dict) and any(_is_lesson_content(item) for item in contents.values())
+
+
+# Disk-memoized _generate_json() for lesson content, so re-running after a failed render or upload
+# reuses the same content. Not used for the curriculum: deleting content_plan.json must produce a fresh one.
+@disk_memoize(GEMINI_CACHE_DIR, GEMINI_CACHE_TTL, namespace=GEMINI_MODEL_NAME, validate=_is_lesson_content)
+def _generate_lesson_json(prompt):
+    return _generate_json(prompt)
+
+
+@disk_memoize(GEMINI_CACHE_DIR, GEMINI_CACHE_TTL, namespace=GEMINI_MODEL_NAME, validate=_is_lesson_batch)
+def _generate_lesson_batch_json(prompt):
+    return _generate_json(prompt)
+
+
 def generate_curriculum(previous_titles=None):
     """Generates the entire course curriculum using Gemini."""
     print("🤖 No content plan found. Generating a new curriculum from scratch...")
     try:
-        genai.configure(api_key=os.environ["GOOGLE_API_KEY"])
-        model = genai.GenerativeModel('models/gemini-2.5-flash')
-
         #Optional: Add prior lesson titles for continuation
         history = ""
         if previous_titles:
@@ -99,9 +299,7 @@ def generate_curriculum(previous_titles=None):
         Respond with ONLY a valid JSON object. The object must contain a key "lessons" which is a list of 20 lesson objects.
         Each lesson object must have these keys: "chapter", "part", "title", "status" (defaulted to "pending"), and "youtube_id" (defaulted to null).
         """
-        response = model.generate_content(prompt)
-        json_string = response.text.strip().replace("```json", "").replace("```", "")
-        curriculum = json.loads(json_string)
+        curriculum = _generate_json(prompt)
         print("✅ New curriculum generated successfully!")
         return curriculum
     except Exception as e:
@@ -113,23 +311,18 @@ def generate_lesson_content(lesson_title):
     """Generates the content for one long-form lesson and its promotional short."""
     print(f"🤖 Generating content for lesson: '{lesson_title}'...")
     try:
-        genai.configure(api_key=os.environ["GOOGLE_API_KEY"])
-        model = genai.GenerativeModel('models/gemini-2.5-flash')
         prompt = f"""
         You are creating a lesson for the 'AI for Developers by {YOUR_NAME}' series. The topic is '{lesson_title}'.
         The style is: Assume the viewer is a beginner developer or non-tech person who wants to learn AI from scratch.
         Use analogies and clear, simple language. Each concept must be explained from a developer's perspective, assuming no prior AI or ML knowledge.
 
         Generate a JSON response with three keys:
-        1. "long_form_slides": A list of 7 to 8 slide objects for a longer, more detailed main video. Each object needs a "title" and "content" key.
-        2. "short_form_highlight": A single, punchy, 1-2 sentence summary for a YouTube Short.
-        3. "hashtags": A string of 5-7 relevant, space-separated hashtags for this lesson (e.g., "#GenerativeAI #LLM #Developer","#NeuralNetworks #BeginnerAI #AIforDevelopers").
-
+        {LESSON_CONTENT_FORMAT}
         Return only valid JSON.
         """
-        response = model.generate_content(prompt)
-        json_string = response.text.strip().replace("```json", "").replace("```", "")
-        content = json.loads(json_string)
+        content = _generate_lesson_json(prompt)
+        if not _is_lesson_content(content):
+            raise ValueError("Response has no non-empty 'long_form_slides' list")
         print("✅ Lesson content generated successfully.")
         return content
     except Exception as e:
@@ -137,6 +330,50 @@ def generate_lesson_content(lesson_title):
         raise
 
 
+def generate_all_lesson_content(lesson_titles):
+    """
+    Generates the content for several lessons with a single Gemini request. Returns {title: content}.
+    The response is keyed by title; lessons missing from it (e.g. truncated output or a reworded
+    title) are generated one by one. Titles whose content can't be generated are left out.
+    """
+    contents = {}
+    if len(lesson_titles) > 1:
+        print(f"🤖 Generating content for {len(lesson_titles)} lessons in one request...")
+        try:
+            formatted = "\n".join(f"- {t}" for t in lesson_titles)
+            prompt = f"""
+            You are creating lessons for the 'AI for Developers by {YOUR_NAME}' series.
+            The style is: Assume the viewer is a beginner developer or non-tech person who wants to learn AI from scratch.
+            Use analogies and clear, simple language. Each concept must be explained from a developer's perspective, assuming no prior AI or ML knowledge.
+
+            Generate a JSON object with one entry per topic listed below.
+            Each key must be the topic title copied exactly as written, and each value a lesson object with three keys:
+            {LESSON_CONTENT_FORMAT}
+            Return only valid JSON.
+
+            The topics are:
+            {formatted}
+            """
+            items = _generate_lesson_batch_json(prompt)
+            if isinstance(items, dict):
+                # Match by title, never by position, so a dropped or reordered entry can't shift content onto another lesson
+                by_title = {" ".join(str(key).split()).casefold(): item for key, item in items.items()}
+                for title in lesson_titles:
+                    item = by_title.get(" ".join(title.split()).casefold())
+                    if _is_lesson_content(item):
+                        contents[title] = item
+        except Exception as e:
+            print(f"⚠️ Batched lesson generation failed: {e}. Falling back to one request per lesson.")
+
+    for title in lesson_titles:
+        if title not in contents:
+            try:
+                contents[title] = generate_lesson_content(title)
+            except Exception:
+                pass  # already reported by generate_lesson_content; the other lessons can still proceed
+    return contents
+
+
 # def generate_visuals(output_dir, video_type, slide_content=None, thumbnail_title=None, slide_number=0, total_slides=0):
 #     """Generates a single professional, PPT-style slide or a thumbnail."""
 #     output_dir.mkdir(exist_ok=True, parents=True)
@@ -216,20 +453,64 @@ def generate_lesson_content(lesson_title):
 #     final_bg.save(path)
 #     return str(path)
 
-def generate_visuals(output_dir, video_type, slide_content=None, thumbnail_title=None, slide_number=0, total_slides=0):
-    """Generates a single professional, PPT-style slide or a thumbnail with corrected alignment."""
+def _wrap_text(text, font, max_width):
+    """
+    Wraps text to max_width pixels. The line length is first estimated from the text's average
+    character width (one measurement); each resulting line is then measured once, and the text is
+    rewrapped narrower if a line full of wide glyphs overflows. Like the old word-by-word loop,
+    words are never split, so a single word wider than max_width keeps its own line.
+    """
+    text = " ".join(text.split())
+    if not text:
+        return [""]
+    width = max(1, int(max_width / (font.getlength(text) / len(text))))
+    while True:
+        lines = textwrap.wrap(text, width=width, break_long_words=False, break_on_hyphens=False)
+        widest = max((font.getlength(line) for line in lines if " " in line), default=0)
+        if widest <= max_width or width == 1:
+            return lines or [""]
+        width = max(1, min(width - 1, int(width * max_width / widest)))
+
+
+@lru_cache(maxsize=None)
+def _font(size):
+    """Loads the slide font at a given size once per process, falling back to PIL's default font."""
+    try:
+        return ImageFont.truetype(str(FONT_FILE), size)
+    except IOError:
+        return FALLBACK_THUMBNAIL_FONT
+
+
+@lru_cache(maxsize=None)
+def _solid_background(size):
+    """Plain background used when no Pexels image is available. Shared, so never modify it in place."""
+    return Image.new('RGBA', size, color=(12, 17, 29))
+
+
+# Per-channel lookup table darkening a background like a (0, 0, 0, 150) black overlay:
+# out = in * (255 - 150) / 255, applied in one pass with Image.point and no overlay image
+_DARKEN_LUT = [v * 105 // 255 for v in range(256)] * 3
+
+
+def generate_visuals(output_dir, video_type, slide_content=None, thumbnail_title=None, slide_number=0, total_slides=0, bg_image=None):
+    """
+    Generates a single professional, PPT-style slide or a thumbnail with corrected alignment.
+    Pass bg_image (e.g. from prefetch_backgrounds) to skip the Pexels lookup.
+    """
     output_dir.mkdir(exist_ok=True, parents=True)
     is_thumbnail = thumbnail_title is not None
 
     width, height = (1920, 1080) if video_type == 'long' else (1080, 1920)
     title = thumbnail_title if is_thumbnail else slide_content.get("title", "")
-    bg_image = get_pexels_image(title, video_type)
+    if bg_image is None:
+        bg_image = get_pexels_image(title, video_type)
 
     if not bg_image:
-        bg_image = Image.new('RGBA', (width, height), color=(12, 17, 29))
-    bg_image = bg_image.resize((width, height)).filter(ImageFilter.GaussianBlur(5))
-    darken_layer = Image.new('RGBA', bg_image.size, (0, 0, 0, 150))
-    final_bg = Image.alpha_composite(bg_image, darken_layer).convert("RGB")
+        bg_image = _solid_background((width, height))
+    # Blur at half resolution (4x fewer pixels) then scale back up; the background is darkened and mostly covered anyway
+    small_bg = bg_image.convert("RGB").resize((width // 2, height // 2), Image.BILINEAR).filter(ImageFilter.GaussianBlur(3))
+    bg_image = small_bg.resize((width, height), Image.BILINEAR)
+    final_bg = bg_image.point(_DARKEN_LUT)
 
     if is_thumbnail and video_type == 'long':
         w, h = final_bg.size
@@ -239,12 +520,9 @@ def generate_visuals(output_dir, video_type, slide_content=None, thumbnail_title
 
     draw = ImageDraw.Draw(final_bg)
 
-    try:
-        title_font = ImageFont.truetype(str(FONT_FILE), 80 if video_type == 'long' else 90)
-        content_font = ImageFont.truetype(str(FONT_FILE), 45 if video_type == 'long' else 55)
-        footer_font = ImageFont.truetype(str(FONT_FILE), 25 if video_type == 'long' else 35)
-    except IOError:
-        title_font = content_font = footer_font = FALLBACK_THUMBNAIL_FONT
+    title_font = _font(80 if video_type == 'long' else 90)
+    content_font = _font(45 if video_type == 'long' else 55)
+    footer_font = _font(25 if video_type == 'long' else 35)
 
     if not is_thumbnail:
         # Header background
@@ -252,18 +530,7 @@ def generate_visuals(output_dir, video_type, slide_content=None, thumbnail_title
         draw.rectangle([0, 0, width, header_height], fill=(25, 40, 65, 200))
 
         # Wrap title text if needed
-        words = title.split()
-        title_lines = []
-        current_line = ""
-        for word in words:
-            test_line = f"{current_line} {word}".strip()
-            bbox = draw.textbbox((0, 0), test_line, font=title_font)
-            if bbox[2] - bbox[0] < width * 0.9:
-                current_line = test_line
-            else:
-                title_lines.append(current_line)
-                current_line = word
-        title_lines.append(current_line)
+        title_lines = _wrap_text(title, title_font, width * 0.9)
 
         # Center vertically in header
         line_height = title_font.getbbox("A")[3] + 10
@@ -287,17 +554,7 @@ def generate_visuals(output_dir, video_type, slide_content=None, thumbnail_title
         content = slide_content.get("content", "")
         is_special_slide = len(content.split()) < 10
 
-        words = content.split()
-        lines = []
-        current_line = ""
-        for word in words:
-            test_line = f"{current_line} {word}".strip()
-            if draw.textbbox((0, 0), test_line, font=content_font)[2] < width * 0.85:
-                current_line = test_line
-            else:
-                lines.append(current_line)
-                current_line = word
-        lines.append(current_line)
+        lines = _wrap_text(content, content_font, width * 0.85)
 
         line_height = content_font.getbbox("A")[3] + 15
         total_text_height = len(lines) * line_height
@@ -319,9 +576,16 @@ def generate_visuals(output_dir, video_type, slide_content=None, thumbnail_title
             bbox = draw.textbbox((0, 0), slide_num_text, font=footer_font)
             draw.text((width - bbox[2] - 40, height - footer_height + 12), slide_num_text, font=footer_font, fill=(180, 180, 180))
 
-    file_prefix = "thumbnail" if is_thumbnail else f"slide_{slide_number:02d}"
-    path = output_dir / f"{file_prefix}.png"
-    final_bg.save(path)
+    if is_thumbnail:
+        path = output_dir / "thumbnail.png"
+        save_options = {}
+    else:
+        # Slides are intermediate frames read straight back by the encoder: JPEG encodes far faster than PNG
+        path = output_dir / f"slide_{slide_number:02d}.jpg"
+        save_options = {"quality": 92, "subsampling": 1, "optimize": False}
+    temp_path = path.with_suffix(f'.tmp{path.suffix}')
+    final_bg.save(temp_path, **save_options)
+    os.replace(temp_path, path)
     return str(path)
 
 def create_video(slide_paths, audio_paths, output_path, video_type):
@@ -331,46 +595,123 @@ def create_video(slide_paths, audio_paths, output_path, video_type):
         if not slide_paths or not audio_paths or len(slide_paths) != len(audio_paths):
             raise ValueError("Mismatch between slides and audio clips, or no slides provided.")
 
-        image_clips = []
-        for i, (img_path, audio_path) in enumerate(zip(slide_paths, audio_paths)):
-            audio_clip = AudioFileClip(str(audio_path))
-            duration = audio_clip.duration + 0.5  # Padding
-            img_clip = (
-                ImageClip(img_path)
-                .set_duration(duration)
-                .set_audio(audio_clip)
-                .fadein(0.5)
-                .fadeout(0.5)
-            )
-            image_clips.append(img_clip)
-
-        final_video = concatenate_videoclips(image_clips, method="compose")
-
-        if BACKGROUND_MUSIC_PATH.exists():
-            print("🎵 Adding background music...")
-            bg_music = AudioFileClip(str(BACKGROUND_MUSIC_PATH)).volumex(0.15)
-            if bg_music.duration < final_video.duration:
-                bg_music = bg_music.fx(vfx.loop, duration=final_video.duration)
-            else:
-                bg_music = bg_music.subclip(0, final_video.duration)
-
-            composite_audio = CompositeAudioClip([
-                final_video.audio.volumex(1.2),
-                bg_music
-            ])
-            final_video = final_video.set_audio(composite_audio)
-
-        final_video.write_videofile(
-            str(output_path),
-            fps=24,
-            codec="libx264",
-            audio_codec="aac",
-            audio_bitrate="192k",
-            preset="medium",
-            threads=4
-        )
+        try:
+            _render_video_ffmpeg(slide_paths, audio_paths, output_path)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"⚠️ Direct ffmpeg render failed ({e}). Falling back to moviepy...")
+            _render_video_moviepy(slide_paths, audio_paths, output_path)
         print(f"✅ {video_type.capitalize()} video created successfully!")
 
     except Exception as e:
         print(f"❌ ERROR during video creation: {e}")
         raise
+
+
+def wav_duration(audio_path):
+    """Reads a WAV file's duration from its header, without spawning ffmpeg."""
+    with wave.open(str(audio_path)) as wav_file:
+        return wav_file.getnframes() / wav_file.getframerate()
+
+
+def _audio_duration(audio_path):
+    try:
+        return wav_duration(audio_path)
+    except (wave.Error, EOFError):
+        # Not a plain PCM WAV; let ffmpeg (via moviepy) probe it
+        audio_clip = AudioFileClip(str(audio_path))
+        try:
+            return audio_clip.duration
+        finally:
+            audio_clip.close()
+
+
+def _render_video_ffmpeg(slide_paths, audio_paths, output_path):
+    """
+    Encodes the whole video with a single ffmpeg process: each slide is a looped still shown for
+    its audio duration + 0.5s with its own fade in/out, slides and padded speech clips are joined
+    by one concat filter, and the background music is looped by the demuxer and mixed in.
+    No frames pass through Python.
+    """
+    durations = [_audio_duration(audio_path) + 0.5 for audio_path in audio_paths]  # Padding
+    total_duration = sum(durations)
+    n = len(slide_paths)
+
+    cmd = [FFMPEG_BINARY, "-y", "-loglevel", "error"]
+    for img_path, duration in zip(slide_paths, durations):
+        cmd += ["-loop", "1", "-framerate", "24", "-t", f"{duration:.3f}", "-i", str(img_path)]
+    for audio_path in audio_paths:
+        cmd += ["-i", str(audio_path)]
+
+    filters = []
+    segments = ""
+    for i, duration in enumerate(durations):
+        filters.append(
+            f"[{i}:v]format=yuv420p,fade=t=in:st=0:d=0.5,fade=t=out:st={max(0.0, duration - 0.5):.3f}:d=0.5[v{i}]"
+        )
+        filters.append(f"[{n + i}:a]apad=whole_dur={duration:.3f}[a{i}]")
+        segments += f"[v{i}][a{i}]"
+    filters.append(f"{segments}concat=n={n}:v=1:a=1[vout][speech]")
+    if BACKGROUND_MUSIC_PATH.exists():
+        print("🎵 Adding background music...")
+        # The demuxer loops the track and stops reading at the video's length; amix applies both gains
+        cmd += ["-stream_loop", "-1", "-t", f"{total_duration:.3f}", "-i", str(BACKGROUND_MUSIC_PATH)]
+        filters.append(f"[speech][{2 * n}:a]amix=inputs=2:duration=first:weights='1.2 0.15':normalize=0[aout]")
+    else:
+        filters.append("[speech]volume=1.2[aout]")
+
+    cmd += [
+        "-filter_complex", ";".join(filters),
+        "-map", "[vout]", "-map", "[aout]",
+        # Slides are static, so veryfast + stillimage keeps quality at a fraction of the CPU of 'medium'
+        "-c:v", "libx264", "-preset", "veryfast", "-tune", "stillimage", "-crf", "22",
+        "-c:a", "aac", "-b:a", "128k",
+        "-movflags", "+faststart", "-threads", "0",
+        "-t", f"{total_duration:.3f}",
+        str(output_path)
+    ]
+    subprocess.run(cmd, check=True)
+
+
+def _render_video_moviepy(slide_paths, audio_paths, output_path):
+    """Slower fallback that composes the video frame by frame with moviepy."""
+    image_clips = []
+    for i, (img_path, audio_path) in enumerate(zip(slide_paths, audio_paths)):
+        audio_clip = AudioFileClip(str(audio_path))
+        duration = audio_clip.duration + 0.5  # Padding
+        img_clip = (
+            ImageClip(img_path)
+            .set_duration(duration)
+            .set_audio(audio_clip)
+            .fadein(0.5)
+            .fadeout(0.5)
+        )
+        image_clips.append(img_clip)
+
+    # Every slide comes from generate_visuals at the same resolution, so plain chaining
+    # works and avoids compositing each output frame
+    final_video = concatenate_videoclips(image_clips, method="chain")
+
+    if BACKGROUND_MUSIC_PATH.exists():
+        print("🎵 Adding background music...")
+        bg_music = AudioFileClip(str(BACKGROUND_MUSIC_PATH)).volumex(0.15)
+        if bg_music.duration < final_video.duration:
+            bg_music = bg_music.fx(vfx.loop, duration=final_video.duration)
+        else:
+            bg_music = bg_music.subclip(0, final_video.duration)
+
+        composite_audio = CompositeAudioClip([
+            final_video.audio.volumex(1.2),
+            bg_music
+        ])
+        final_video = final_video.set_audio(composite_audio)
+
+    final_video.write_videofile(
+        str(output_path),
+        fps=24,
+        codec="libx264",
+        audio_codec="aac",
+        audio_bitrate="128k",
+        preset="veryfast",
+        ffmpeg_params=["-tune", "stillimage", "-crf", "22", "-movflags", "+faststart"],
+        threads=0
+    )
@@ -3,10 +3,15 @@
 # for both local use and GitHub Actions deployment.
 
 import os
+import random
+import time
+import httplib2
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaFileUpload
 from pathlib import Path
 
@@ -15,6 +20,14 @@ CLIENT_SECRETS_FILE = Path('client_secrets.json')
 CREDENTIALS_FILE = Path('credentials.json')
 YOUTUBE_UPLOAD_SCOPE = ["https://www.googleapis.com/auth/youtube.upload"]
 
+# Resumable upload settings: 8 MiB chunks, retried with exponential back-off on transient failures
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+MAX_UPLOAD_RETRIES = 5
+RETRIABLE_STATUS_CODES = (500, 502, 503, 504)
+RETRIABLE_EXCEPTIONS = (httplib2.HttpLib2Error, OSError)
+
+_YOUTUBE_SERVICE = None
+
 def get_authenticated_service():
     """
     Handles the entire OAuth2 flow and returns an authenticated YouTube service object.
@@ -51,7 +64,31 @@ def get_authenticated_service():
             f.write(credentials.to_json())
         print(f"INFO: Credentials saved to {CREDENTIALS_FILE}")
             
-    return build('youtube', 'v3', credentials=credentials)
+    # Generous timeout so a slow 8 MiB chunk doesn't abort the upload
+    http = AuthorizedHttp(credentials, http=httplib2.Http(timeout=300))
+    return build('youtube', 'v3', http=http)
+
+
+def get_youtube_service():
+    """
+    Returns a process-wide YouTube service, authenticating only on first use.
+    The service's authorized HTTP client refreshes the access token by itself when it expires.
+    """
+    global _YOUTUBE_SERVICE
+    if _YOUTUBE_SERVICE is None:
+        _YOUTUBE_SERVICE = get_authenticated_service()
+    return _YOUTUBE_SERVICE
+
+
+def _wait_before_retry(retries, error):
+    """Sleeps with jittered exponential back-off before resuming an upload; re-raises after too many attempts."""
+    retries += 1
+    if retries > MAX_UPLOAD_RETRIES:
+        raise error
+    delay = random.uniform(0, 2 ** retries)
+    print(f"⚠️ Upload chunk failed ({error}). Retrying in {delay:.1f}s (attempt {retries}/{MAX_UPLOAD_RETRIES})...")
+    time.sleep(delay)
+    return retries
 
 
 # MODIFIED: Added thumbnail_path parameter
@@ -59,7 +96,7 @@ def upload_to_youtube(video_path, title, description, tags, thumbnail_path=None)
     """Uploads a video to YouTube with the given metadata and optionally a thumbnail."""
     print(f"⬆️ Uploading '{video_path}' to YouTube...")
     try:
-        youtube = get_authenticated_service()
+        youtube = get_youtube_service()
         
         request_body = {
             'snippet': {
@@ -74,7 +111,7 @@ def upload_to_youtube(video_path, title, description, tags, thumbnail_path=None)
             }
         }
 
-        media = MediaFileUpload(str(video_path), chunksize=-1, resumable=True)
+        media = MediaFileUpload(str(video_path), chunksize=UPLOAD_CHUNK_SIZE, resumable=True, mimetype="video/mp4")
         
         request = youtube.videos().insert(
             part=','.join(request_body.keys()),
@@ -83,13 +120,28 @@ def upload_to_youtube(video_path, title, description, tags, thumbnail_path=None)
         )
 
         response = None
+        retries = 0
         while response is None:
-            status, response = request.next_chunk()
-            if status:
-                print(f"Uploaded {int(status.progress() * 100)}%.")
+            try:
+                status, response = request.next_chunk()
+                if status:
+                    print(f"Uploaded {int(status.progress() * 100)}%.")
+                retries = 0
+            except HttpError as e:
+                if e.resp.status not in RETRIABLE_STATUS_CODES:
+                    raise
+                retries = _wait_before_retry(retries, e)
+            except RETRIABLE_EXCEPTIONS as e:
+                retries = _wait_before_retry(retries, e)
                 
         video_id = response.get('id')
-        print(f"✅ Video uploaded successfully! Video ID: {video_id}")
+        # The insert response already carries the status: 'uploaded' means YouTube has the whole file
+        # and the watch URL is valid; processing continues in the background.
+        upload_status = response.get('status', {}).get('uploadStatus')
+        if upload_status in ('uploaded', 'processed'):
+            print(f"✅ Video uploaded successfully! Video ID: {video_id}")
+        else:
+            print(f"⚠️ Video {video_id} was uploaded but its upload status is '{upload_status}'.")
 
         # ADDED: Thumbnail upload logic
         if thumbnail_path and os.path.exists(thumbnail_path):
@@ -111,4 +163,3 @@ def upload_to_youtube(video_path, title, description, tags, thumbnail_path=None)
     except Exception as e:
         print(f"❌ ERROR: Failed to upload to YouTube. {e}")
         raise
-